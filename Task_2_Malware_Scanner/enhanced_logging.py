@@ -7,7 +7,7 @@ import os
 import json
 import csv
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class EnhancedLogger:
     """Enhanced logging class with multiple output formats"""
@@ -124,9 +124,9 @@ class EnhancedLogger:
                    f"System: {scan_data['hostname']} ({scan_data['ip']}) | "
                    f"OS: {scan_data['os']}\n")
     
-    def create_scan_summary(self, scan_stats: Dict[str, Any]):
-        """Create a comprehensive scan summary report"""
-        summary_file = f'{self.output_dir}/{self.date_str}-scan-summary.txt'
+    def create_scan_summary(self, scan_stats: Dict[str, Any], summary_file: Optional[str] = None):
+        """Create a comprehensive scan summary report (defaults to the daily summary file)"""
+        summary_file = summary_file or f'{self.output_dir}/{self.date_str}-scan-summary.txt'
         
         with open(summary_file, 'w', encoding='utf-8') as f:
             f.write("╔" + "═" * 78 + "╗\n")
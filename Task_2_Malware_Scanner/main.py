@@ -13,6 +13,11 @@ import argparse
 import uuid
 # import netifaces
 import socket
+import heapq
+import string
+import tempfile
+import subprocess
+import glob
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
@@ -23,6 +28,13 @@ importlib.reload(sys)
 SCAN_EXTENSIONS = ['.exe', '.dll', '.sys', '.doc', '.docx', '.xls', '.xlsx', '.py', '.xml', '.cfg', '.txt', '.ppt', '.pptx', '.hwp', '.xapk', '.jpg', '.jpeg', '.png']
 EXCLUDE_DIRS = ['venv', 'venv2', '.idea', 'lib']
 
+# Lines held in memory per sorted run when sorting manifests / signatures on disk
+SORT_CHUNK_LINES = 1000000
+# Max sorted runs merged (and held open) at once; more runs are merged in several passes
+SORT_MERGE_FAN_IN = 64
+# Threats buffered before being appended to the threat logs during a manifest scan
+THREAT_LOG_BATCH = 10000
+
 _today_ = datetime.today().strftime('%Y-%m-%d')
 _ctime_ = datetime.today().strftime('%Y-%m-%d %H:%M:%S')
 
@@ -31,7 +43,10 @@ _home_path_ = f'{os.getcwd()}'
 
 _engine_zipfile_ = f'{_home_path_}/{_today_}.zip'
 _engine_extract_file_ = f'{_home_path_}/engine.db'
+_engine_sorted_file_ = f'{_home_path_}/engine.sorted.db'
 _scan_result_logs_ = f'{_home_path_}/output/{_today_}-infected.log'
+# Sort spill files go to disk next to the output, not to /tmp (often RAM-backed tmpfs)
+_sort_tmp_dir_ = f'{_home_path_}/output/tmp'
 
 
 class Bcolors:
@@ -157,9 +172,147 @@ def hash_exists_in_db(check_hash):
     return False
 
 
+def is_sha256(_value):
+    return len(_value) == 64 and all(c in string.hexdigits for c in _value)
+
+
+def parse_manifest_line(line):
+    """Return 'sha256,path' for a manifest line ('path,sha256' or a plain hash), or None"""
+    line = line.strip()
+    if len(line) == 0 or line.startswith('#'):
+        return None
+    if ',' in line:
+        _path, _hash = line.rsplit(',', 1)
+    else:
+        _path, _hash = '', line
+    _hash = _hash.strip().lower()
+    if not is_sha256(_hash):
+        return None
+    return f'{_hash},{_path.strip()}\n'
+
+
+def external_sort(_lines, _chunk_lines=None, _tmp_dir=None):
+    """Yield lines in sorted order, spilling sorted runs to temp files so memory stays bounded"""
+    _chunk_lines = _chunk_lines or SORT_CHUNK_LINES
+    _tmp_dir = _tmp_dir or _sort_tmp_dir_
+    _runs = []
+    _run_files = []
+    try:
+        _chunk = []
+        for line in _lines:
+            _chunk.append(line)
+            if len(_chunk) >= _chunk_lines:
+                _runs.append(write_sorted_run(_chunk, _tmp_dir))
+                _chunk = []
+
+        if not _runs:
+            yield from sorted(_chunk)
+            return
+        if _chunk:
+            _runs.append(write_sorted_run(_chunk, _tmp_dir))
+            _chunk = []
+
+        # Merge in bounded passes so no more than SORT_MERGE_FAN_IN files are open at once
+        while len(_runs) > SORT_MERGE_FAN_IN:
+            _group, _runs = _runs[:SORT_MERGE_FAN_IN], _runs[SORT_MERGE_FAN_IN:]
+            _runs.append(merge_sorted_runs(_group, _tmp_dir))
+
+        _run_files = [open(_run, 'r', encoding='utf-8') for _run in _runs]
+        yield from heapq.merge(*_run_files)
+    finally:
+        for f in _run_files:
+            f.close()
+        for _run in _runs:
+            remove_sorted_run(_run)
+
+
+def write_sorted_run(_chunk, _tmp_dir):
+    _chunk.sort()
+    os.makedirs(_tmp_dir, exist_ok=True)
+    _fd, _run = tempfile.mkstemp(prefix='scan-run-', suffix='.tmp', dir=_tmp_dir)
+    with os.fdopen(_fd, 'w', encoding='utf-8') as f:
+        f.writelines(_chunk)
+    return _run
+
+
+def merge_sorted_runs(_runs, _tmp_dir):
+    """Merge sorted run files into one new run file and remove the inputs"""
+    _fd, _merged_run = tempfile.mkstemp(prefix='scan-run-', suffix='.tmp', dir=_tmp_dir)
+    _run_files = []
+    try:
+        _run_files = [open(_run, 'r', encoding='utf-8') for _run in _runs]
+        with os.fdopen(_fd, 'w', encoding='utf-8') as f:
+            f.writelines(heapq.merge(*_run_files))
+    except BaseException:
+        remove_sorted_run(_merged_run)
+        raise
+    finally:
+        for f in _run_files:
+            f.close()
+        for _run in _runs:
+            remove_sorted_run(_run)
+    return _merged_run
+
+
+def remove_sorted_run(_run):
+    try:
+        os.remove(_run)
+    except OSError:
+        pass
+
+
+def read_signature_hashes(filename):
+    with open(filename, 'r', encoding='utf-8', errors='replace') as database:
+        for line in database:
+            line = line.strip().lower()
+            if len(line) != 0 and not line.startswith('#') and is_sha256(line):
+                yield f'{line}\n'
+
+
+def build_sorted_engine(_tmp_dir=None):
+    """Write a sorted, de-duplicated copy of the signature DB for merge-join lookups"""
+    if os.path.isfile(_engine_sorted_file_):
+        if os.stat(_engine_sorted_file_).st_mtime >= os.stat(_engine_extract_file_).st_mtime:
+            return _engine_sorted_file_
+
+    print(f'{Bcolors.Yellow}- Sorting Engine Signatures: {_engine_sorted_file_}{Bcolors.Endc}')
+    # Unique staging file so concurrent --hashes runs cannot interleave their writes
+    _fd, _tmp_file = tempfile.mkstemp(prefix='engine.sorted.', suffix='.tmp', dir=_home_path_)
+    _previous = None
+    try:
+        with os.fdopen(_fd, 'w', encoding='utf-8') as f:
+            for line in external_sort(read_signature_hashes(_engine_extract_file_), _tmp_dir=_tmp_dir):
+                if line != _previous:
+                    f.write(line)
+                    _previous = line
+        os.replace(_tmp_file, _engine_sorted_file_)
+    except BaseException:
+        remove_sorted_run(_tmp_file)
+        raise
+    return _engine_sorted_file_
+
+
+def merge_join_hashes(_sorted_records, _sorted_signatures):
+    """Yield every sorted 'sha256,path' record whose hash appears in the sorted signature stream"""
+    _signatures = iter(_sorted_signatures)
+    _signature = next(_signatures, None)
+    for record in _sorted_records:
+        _hash = record[:64]
+        while _signature is not None and _signature < _hash:
+            _signature = next(_signatures, None)
+        if _signature is None:
+            break
+        if _signature == _hash:
+            yield record
+
+
 def scan_result_logs(scan_data):
     """Enhanced logging function with JSON format support"""
-    import json
+    write_threat_logs([scan_data])
+
+
+def write_threat_logs(threat_list):
+    """Append a batch of threats to the JSON and structured logs"""
     
     _make_output_dir = f'{_home_path_}/output'
     
@@ -170,36 +323,51 @@ def scan_result_logs(scan_data):
     # JSON log file
     json_log_file = f'{_make_output_dir}/{_today_}-threats.json'
     
-    # Read existing JSON data if file exists
-    threats = []
-    if os.path.exists(json_log_file):
-        try:
-            with open(json_log_file, 'r', encoding='utf-8') as f:
-                threats = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            threats = []
-    
-    # Add new threat data
-    threats.append(scan_data)
-    
-    # Write updated JSON data
-    with open(json_log_file, 'w', encoding='utf-8') as f:
-        json.dump(threats, f, indent=2, ensure_ascii=False)
+    # Append to the JSON array in place, so memory and I/O do not grow with the log
+    append_json_array(json_log_file, threat_list)
     
     # Also create a structured text log for easy reading
     structured_log_file = f'{_make_output_dir}/{_today_}-threats-structured.log'
     with open(structured_log_file, 'a', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write(f"THREAT DETECTION REPORT\n")
-        f.write("=" * 80 + "\n")
-        f.write(f"Detection Time    : {scan_data['datetime']}\n")
-        f.write(f"Scan ID          : {scan_data['scan_id']}\n")
-        f.write(f"System Info      : {scan_data['os']} | {scan_data['hostname']} | {scan_data['ip']}\n")
-        f.write(f"Infected File    : {scan_data['infected_file']}\n")
-        f.write(f"SHA256 Hash      : {scan_data['sha256']}\n")
-        f.write(f"File Created     : {scan_data['created_at']}\n")
-        f.write(f"File Modified    : {scan_data['modified_at']}\n")
-        f.write("=" * 80 + "\n\n")
+        for scan_data in threat_list:
+            f.write("=" * 80 + "\n")
+            f.write(f"THREAT DETECTION REPORT\n")
+            f.write("=" * 80 + "\n")
+            f.write(f"Detection Time    : {scan_data['datetime']}\n")
+            f.write(f"Scan ID          : {scan_data['scan_id']}\n")
+            f.write(f"System Info      : {scan_data['os']} | {scan_data['hostname']} | {scan_data['ip']}\n")
+            f.write(f"Infected File    : {scan_data['infected_file']}\n")
+            f.write(f"SHA256 Hash      : {scan_data['sha256']}\n")
+            f.write(f"File Created     : {scan_data['created_at']}\n")
+            f.write(f"File Modified    : {scan_data['modified_at']}\n")
+            f.write("=" * 80 + "\n\n")
+
+
+def append_json_array(json_log_file, items):
+    """Append items to the JSON array in json_log_file by rewriting only its closing bracket"""
+    import json
+
+    _items = ',\n'.join('  ' + json.dumps(item, indent=2, ensure_ascii=False).replace('\n', '\n  ') for item in items)
+    _items = _items.encode('utf-8')
+
+    if os.path.exists(json_log_file):
+        with open(json_log_file, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            _size = f.tell()
+            _tail_start = max(0, _size - 4096)
+            f.seek(_tail_start)
+            _tail = f.read().rstrip()
+            if _tail.endswith(b']'):
+                _body = _tail[:-1].rstrip()
+                _is_empty = _body.endswith(b'[')
+                f.seek(_tail_start + len(_body))
+                f.truncate()
+                f.write((b'\n' if _is_empty else b',\n') + _items + b'\n]')
+                return
+
+    # Missing or unreadable log: start a new array, as the full rewrite used to
+    with open(json_log_file, 'wb') as f:
+        f.write(b'[\n' + _items + b'\n]')
 
 
 def make_hash(_f_file_name):
@@ -308,59 +476,121 @@ def scan_file(_f_file_name):
     return _scan_result
 
 
-def scan_directory(_scan_path):
+def get_shard_index(_shard_key, _shard_count):
+    # md5 is stable across processes and hosts (unlike hash()) and spreads similar paths evenly
+    _digest = hashlib.md5(_shard_key.encode('utf-8', 'surrogateescape')).hexdigest()
+    return int(_digest[:8], 16) % _shard_count
+
+
+def iter_scan_files(_scan_path, _shard_index=0, _shard_count=1, _shard_by='topdir'):
+    """Yield the files under _scan_path that belong to the given shard"""
+    for subdir, dirs, files in os.walk(_scan_path):
+        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+        if _shard_count > 1 and _shard_by == 'topdir' and subdir == _scan_path:
+            # Prune other shards' top-level directories so they are never walked
+            dirs[:] = [d for d in dirs if get_shard_index(d, _shard_count) == _shard_index]
+            files = [f for f in files if get_shard_index(f, _shard_count) == _shard_index]
+        for file in files:
+            _f_file_name = os.path.join(subdir, file)
+            if _shard_count > 1 and _shard_by == 'hash':
+                _rel_path = os.path.relpath(_f_file_name, _scan_path).replace(os.sep, '/')
+                if get_shard_index(_rel_path, _shard_count) != _shard_index:
+                    continue
+            yield os.path.realpath(_f_file_name)
+
+
+def get_shard_dir(_scan_id):
+    return f'{_home_path_}/output/shards/{_scan_id}'
+
+
+def get_shard_file(_scan_id, _shard_index, _shard_count):
+    return f'{get_shard_dir(_scan_id)}/shard-{_shard_index}-of-{_shard_count}.json'
+
+
+def write_shard_result(_shard_file, shard_data):
+    """Atomically write one shard's stats summary and threats"""
+    import json
+
+    os.makedirs(os.path.dirname(_shard_file), exist_ok=True)
+    _tmp_file = f'{_shard_file}.tmp'
+    with open(_tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(shard_data, f, indent=2, ensure_ascii=False)
+    os.replace(_tmp_file, _shard_file)
+
+
+def parse_shard(_value):
+    """argparse type for 'INDEX/COUNT', e.g. '0/4'"""
+    try:
+        _shard_index, _shard_count = (int(n) for n in _value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected INDEX/COUNT, got {_value!r}')
+    if _shard_count < 2:
+        raise argparse.ArgumentTypeError(f'shard COUNT must be at least 2, got {_value!r}')
+    if not 0 <= _shard_index < _shard_count:
+        raise argparse.ArgumentTypeError(f'shard index must be in 0..COUNT-1, got {_value!r}')
+    return _shard_index, _shard_count
+
+
+def scan_directory(_scan_path, _shard_index=0, _shard_count=1, _shard_by='topdir', _scan_id=None):
     _log_ipaddr = get_ip_address()
     _log_hostname = get_hostname()
-    _log_scan_id = create_job_id()
+    _log_scan_id = _scan_id or create_job_id()
     _log_os_ver = get_osver()
     _make_output_dir = f'{_home_path_}/output'  # Define the output directory variable
+    _sharded = _shard_count > 1
+    _shard_threats = []
 
     _count_submitted_file = 0
     _count_infected_file = 0
-    _total_files = sum([len(files) for r, d, files in os.walk(_scan_path)])
+    _total_files = sum(1 for _ in iter_scan_files(_scan_path, _shard_index, _shard_count, _shard_by))
 
     # Enhanced scan initialization display
     print(f'{Bcolors.Cyan}📁 Scanning Directory: {_scan_path}{Bcolors.Endc}')
+    if _sharded:
+        print(f'{Bcolors.Cyan}🧩 Shard: {_shard_index}/{_shard_count} (by {_shard_by}) | Scan ID: {_log_scan_id}{Bcolors.Endc}')
     print(f'{Bcolors.White}📊 Total Files to Scan: {_total_files:,}{Bcolors.Endc}')
     print(f'{Bcolors.Green}🔍 Starting malware scan...{Bcolors.Endc}\n')
 
+    _scan_started_at = datetime.today().strftime('%Y-%m-%d %H:%M:%S')
+    _scan_start_epoch = time.time()
     _scan_start_time = time.perf_counter()
 
     with ThreadPoolExecutor(max_workers=50) as executor:
         # Submit a task for each file in the directory
-        for subdir, dirs, files in os.walk(_scan_path):
-            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-            for file in files:
-                _f_file_name = os.path.realpath(os.path.join(subdir, file))
-                result = [executor.submit(scan_file, _f_file_name)]
-                for future in as_completed(result):
-                    result = future.result()
-                    _count_submitted_file += 1
-                    _scan_duration_time = time.perf_counter() + _scan_start_time
-                    
-                    # Enhanced progress display with progress bar (for ALL files)
-                    progress = (_count_submitted_file / _total_files) * 100 if _total_files > 0 else 0
-                    progress_bar = '█' * int(progress // 2) + '░' * (50 - int(progress // 2))
-                    
-                    print(f'\r{Bcolors.Blue}[{progress_bar}]{Bcolors.Endc} {progress:.1f}% | '
-                          f'{Bcolors.White}Scanned: {_count_submitted_file:,}/{_total_files:,}{Bcolors.Endc} | '
-                          f'{Bcolors.Red if _count_infected_file > 0 else Bcolors.Green}Threats: {_count_infected_file}{Bcolors.Endc}', end='', flush=True)
+        for _f_file_name in iter_scan_files(_scan_path, _shard_index, _shard_count, _shard_by):
+            result = [executor.submit(scan_file, _f_file_name)]
+            for future in as_completed(result):
+                result = future.result()
+                _count_submitted_file += 1
+                _scan_duration_time = time.perf_counter() + _scan_start_time
+                
+                # Enhanced progress display with progress bar (for ALL files)
+                progress = (_count_submitted_file / _total_files) * 100 if _total_files > 0 else 0
+                progress_bar = '█' * int(progress // 2) + '░' * (50 - int(progress // 2))
+                
+                print(f'\r{Bcolors.Blue}[{progress_bar}]{Bcolors.Endc} {progress:.1f}% | '
+                      f'{Bcolors.White}Scanned: {_count_submitted_file:,}/{_total_files:,}{Bcolors.Endc} | '
+                      f'{Bcolors.Red if _count_infected_file > 0 else Bcolors.Green}Threats: {_count_infected_file}{Bcolors.Endc}', end='', flush=True)
+                
+                if result:
+                    _count_infected_file += 1
                     
-                    if result:
-                        _count_infected_file += 1
-                        
-                        # Create structured data for JSON logging
-                        threat_data = {
-                            "datetime": datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
-                            "scan_id": str(_log_scan_id),
-                            "os": _log_os_ver,
-                            "hostname": _log_hostname,
-                            "ip": _log_ipaddr,
-                            "infected_file": result.split("|")[0],
-                            "sha256": result.split("|")[1],
-                            "created_at": result.split("|")[2],
-                            "modified_at": result.split("|")[3]
-                        }
+                    # Create structured data for JSON logging
+                    threat_data = {
+                        "datetime": datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
+                        "scan_id": str(_log_scan_id),
+                        "os": _log_os_ver,
+                        "hostname": _log_hostname,
+                        "ip": _log_ipaddr,
+                        "infected_file": result.split("|")[0],
+                        "sha256": result.split("|")[1],
+                        "created_at": result.split("|")[2],
+                        "modified_at": result.split("|")[3]
+                    }
+                    if _sharded:
+                        # Shards are merged later; concurrent writers must not share the threat logs
+                        _shard_threats.append(threat_data)
+                    else:
                         scan_result_logs(threat_data)
     print('\n')
     
@@ -368,6 +598,27 @@ def scan_directory(_scan_path):
     _scan_end_time = time.perf_counter()
     scan_duration = _scan_end_time - _scan_start_time
     scan_speed = _count_submitted_file / scan_duration if scan_duration > 0 else 0
+
+    if _sharded:
+        _shard_file = get_shard_file(_log_scan_id, _shard_index, _shard_count)
+        write_shard_result(_shard_file, {
+            "scan_id": str(_log_scan_id),
+            "shard_index": _shard_index,
+            "shard_count": _shard_count,
+            "shard_by": _shard_by,
+            "scan_path": _scan_path,
+            "os": _log_os_ver,
+            "hostname": _log_hostname,
+            "ip": _log_ipaddr,
+            "started_at": _scan_started_at,
+            "start_epoch": _scan_start_epoch,
+            "end_epoch": time.time(),
+            "total_files": _total_files,
+            "scanned_files": _count_submitted_file,
+            "threats_found": _count_infected_file,
+            "duration": scan_duration,
+            "threats": _shard_threats
+        })
     
     # Enhanced scan completion display
     print(f'\n{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
@@ -378,7 +629,11 @@ def scan_directory(_scan_path):
     print(f'   • Scan Duration: {Bcolors.White}{scan_duration:.2f} seconds{Bcolors.Endc}')
     print(f'   • Average Speed: {Bcolors.White}{scan_speed:.1f} files/sec{Bcolors.Endc}')
     
-    if _count_infected_file >= 1:
+    if _sharded:
+        print(f'   • Threats Found: {Bcolors.Red if _count_infected_file > 0 else Bcolors.Green}{_count_infected_file}{Bcolors.Endc}')
+        print(f'\n{Bcolors.Yellow}📋 Shard results saved to:{Bcolors.Endc} {Bcolors.White}{_shard_file}{Bcolors.Endc}')
+        print(f'{Bcolors.Yellow}   Merge all shards with: --merge {get_shard_dir(_log_scan_id)}{Bcolors.Endc}')
+    elif _count_infected_file >= 1:
         print(f'   • {Bcolors.Red}⚠️  THREATS DETECTED: {_count_infected_file} file(s){Bcolors.Endc}')
         print(f'\n{Bcolors.Yellow}📋 Detailed results saved to:{Bcolors.Endc}')
         print(f'   • JSON Format: {Bcolors.White}{_make_output_dir}/{_today_}-threats.json{Bcolors.Endc}')
@@ -405,18 +660,271 @@ def scan_directory(_scan_path):
     print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}\n')
 
 
+def run_local_shards(_scan_path, _shard_count, _shard_by='topdir'):
+    """Coordinator: scan every shard in its own worker process, merge them, and return whether the scan is complete"""
+    _log_scan_id = str(create_job_id())
+    _shard_dir = get_shard_dir(_log_scan_id)
+    os.makedirs(_shard_dir, exist_ok=True)
+
+    print(f'{Bcolors.Cyan}📁 Scanning Directory: {_scan_path}{Bcolors.Endc}')
+    print(f'{Bcolors.Cyan}🧩 Shards: {_shard_count} local workers (by {_shard_by}) | Scan ID: {_log_scan_id}{Bcolors.Endc}')
+    print(f'{Bcolors.White}📋 Worker logs: {_shard_dir}{Bcolors.Endc}\n')
+
+    _workers = []
+    for _shard_index in range(_shard_count):
+        _worker_log = open(f'{_shard_dir}/shard-{_shard_index}-of-{_shard_count}.log', 'w', encoding='utf-8')
+        _cmd = [sys.executable, os.path.abspath(__file__), '--path', _scan_path,
+                '--shard', f'{_shard_index}/{_shard_count}', '--shard-by', _shard_by, '--scan-id', _log_scan_id]
+        _process = subprocess.Popen(_cmd, stdout=_worker_log, stderr=subprocess.STDOUT, cwd=_home_path_)
+        _workers.append((_shard_index, _process, _worker_log))
+
+    for _shard_index, _process, _worker_log in _workers:
+        _process.wait()
+        _worker_log.close()
+        if _process.returncode != 0:
+            print(f'{Bcolors.Yellow}[-] Shard {_shard_index}/{_shard_count} exited with code {_process.returncode}{Bcolors.Endc}')
+        elif not os.path.isfile(get_shard_file(_log_scan_id, _shard_index, _shard_count)):
+            print(f'{Bcolors.Yellow}[-] Shard {_shard_index}/{_shard_count} wrote no results, see {_worker_log.name}{Bcolors.Endc}')
+        else:
+            print(f'{Bcolors.Green}[+] Shard {_shard_index}/{_shard_count} finished{Bcolors.Endc}')
+    print('')
+
+    return merge_shard_results(_shard_dir)
+
+
+def merge_shard_results(_shard_dir):
+    """Merge per-shard result files into the threat logs and one scan report; return whether it is complete"""
+    import json
+    from enhanced_logging import EnhancedLogger
+
+    shards = {}
+    for _name in sorted(os.listdir(_shard_dir)):
+        if _name.startswith('shard-') and _name.endswith('.json'):
+            with open(f'{_shard_dir}/{_name}', 'r', encoding='utf-8') as f:
+                shard_data = json.load(f)
+            shards[shard_data['shard_index']] = shard_data
+
+    if not shards:
+        print(f'{Bcolors.Yellow}[-] No shard results found in {_shard_dir}{Bcolors.Endc}')
+        return False
+
+    _scan_ids = {s['scan_id'] for s in shards.values()}
+    _shard_counts = {s['shard_count'] for s in shards.values()}
+    if len(_scan_ids) != 1 or len(_shard_counts) != 1:
+        print(f'{Bcolors.Yellow}[-] Shard results in {_shard_dir} mix scan IDs or shard counts: {sorted(_scan_ids)} / {sorted(_shard_counts)}{Bcolors.Endc}')
+        return False
+
+    _log_scan_id = _scan_ids.pop()
+    _shard_count = _shard_counts.pop()
+    _make_output_dir = f'{_home_path_}/output'
+    # Reports are found by scan_id, whatever day they were first merged on
+    _previous_reports = sorted(glob.glob(f'{_make_output_dir}/*-scan-{_log_scan_id}.json'))
+    _report_file = _previous_reports[0] if _previous_reports else f'{_make_output_dir}/{_today_}-scan-{_log_scan_id}.json'
+    _logged_shards = set()
+    if _previous_reports:
+        with open(_report_file, 'r', encoding='utf-8') as f:
+            _previous_report = json.load(f)
+        if _previous_report.get('complete'):
+            print(f'{Bcolors.Yellow}[-] Scan {_log_scan_id} already merged: {_report_file}{Bcolors.Endc}')
+            return True
+        _logged_shards = {s['shard_index'] for s in _previous_report.get('shards', [])}
+
+    _ordered = [shards[i] for i in sorted(shards)]
+    _missing_shards = [i for i in range(_shard_count) if i not in shards]
+    threats = [threat for s in _ordered for threat in s['threats']]
+    # A partial merge already logged its shards' threats; only log the newly arrived shards
+    _new_threats = [threat for s in _ordered if s['shard_index'] not in _logged_shards for threat in s['threats']]
+    if _new_threats:
+        write_threat_logs(_new_threats)
+
+    _total_files = sum(s['total_files'] for s in _ordered)
+    _scanned_files = sum(s['scanned_files'] for s in _ordered)
+    # Shards run concurrently, so the scan took as long as the span from first start to last finish
+    _start_epoch = min(s['start_epoch'] for s in _ordered)
+    scan_duration = max(s['end_epoch'] for s in _ordered) - _start_epoch
+    scan_speed = _scanned_files / scan_duration if scan_duration > 0 else 0
+    _hosts = sorted({f"{s['hostname']} ({s['ip']})" for s in _ordered})
+
+    report = {
+        "scan_id": _log_scan_id,
+        "scan_path": _ordered[0]['scan_path'],
+        "shard_by": _ordered[0]['shard_by'],
+        "shard_count": _shard_count,
+        "shards_merged": len(_ordered),
+        "missing_shards": _missing_shards,
+        "complete": not _missing_shards,
+        "hosts": _hosts,
+        "started_at": datetime.fromtimestamp(_start_epoch).strftime('%Y-%m-%d %H:%M:%S'),
+        "duration": scan_duration,
+        "total_files": _total_files,
+        "scanned_files": _scanned_files,
+        "threats_found": len(threats),
+        "shards": [{k: v for k, v in s.items() if k != 'threats'} for s in _ordered],
+        "threats": threats
+    }
+    os.makedirs(_make_output_dir, exist_ok=True)
+    with open(_report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    # One summary per scan, next to its report, so merges of other scans do not overwrite it
+    _summary_file = f'{_report_file[:-len(".json")]}-summary.txt'
+    EnhancedLogger(_home_path_, _today_).create_scan_summary({
+        "scan_time": report['started_at'],
+        "scan_id": _log_scan_id,
+        "scan_path": report['scan_path'],
+        "total_files": _total_files,
+        "scanned_files": _scanned_files,
+        "threats_found": len(threats),
+        "duration": f'{scan_duration:.2f} seconds',
+        "speed": f'{scan_speed:.1f} files/sec',
+        "system_info": ', '.join(_hosts),
+        "engine_version": get_engine_last_updated_date(_engine_extract_file_) if os.path.isfile(_engine_extract_file_) else 'N/A',
+        "signatures": f'{raw_count(_engine_extract_file_):,}' if os.path.isfile(_engine_extract_file_) else 'N/A'
+    }, summary_file=_summary_file)
+
+    print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
+    print(f'{Bcolors.White}🏁 SHARDED SCAN MERGED{Bcolors.Endc}')
+    print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
+    print(f'{Bcolors.Cyan}📊 Scan Summary:{Bcolors.Endc}')
+    print(f'   • Scan ID: {Bcolors.White}{_log_scan_id}{Bcolors.Endc}')
+    print(f'   • Shards Merged: {Bcolors.White}{len(_ordered)}/{_shard_count}{Bcolors.Endc}')
+    print(f'   • Files Scanned: {Bcolors.White}{_scanned_files:,}{Bcolors.Endc}')
+    print(f'   • Scan Duration: {Bcolors.White}{scan_duration:.2f} seconds{Bcolors.Endc}')
+    print(f'   • Average Speed: {Bcolors.White}{scan_speed:.1f} files/sec{Bcolors.Endc}')
+    if _missing_shards:
+        print(f'   • {Bcolors.Yellow}⚠️  INCOMPLETE - missing shards: {", ".join(str(i) for i in _missing_shards)}{Bcolors.Endc}')
+    if threats:
+        print(f'   • {Bcolors.Red}⚠️  THREATS DETECTED: {len(threats)} file(s){Bcolors.Endc}')
+    else:
+        print(f'   • {Bcolors.Green}✅ No threats detected{Bcolors.Endc}')
+    print(f'\n{Bcolors.Yellow}📋 Scan report saved to:{Bcolors.Endc} {Bcolors.White}{_report_file}{Bcolors.Endc}')
+    print(f'{Bcolors.Yellow}📋 Scan summary saved to:{Bcolors.Endc} {Bcolors.White}{_summary_file}{Bcolors.Endc}')
+    print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}\n')
+    return not _missing_shards
+
+
+def scan_hash_manifest(_manifest_file, _tmp_dir=None):
+    """Check a 'path,sha256' (or plain hash) manifest against the engine without touching the listed files"""
+    _log_ipaddr = get_ip_address()
+    _log_hostname = get_hostname()
+    _log_scan_id = create_job_id()
+    _log_os_ver = get_osver()
+    _make_output_dir = f'{_home_path_}/output'
+
+    _count_entries = 0
+    _count_rejected = 0
+    _count_infected_file = 0
+    _threat_batch = []
+
+    print(f'{Bcolors.Cyan}📄 Scanning Hash Manifest: {_manifest_file}{Bcolors.Endc}')
+    print(f'{Bcolors.Green}🔍 Starting manifest scan...{Bcolors.Endc}\n')
+
+    _scan_start_time = time.perf_counter()
+    _sorted_engine = build_sorted_engine(_tmp_dir)
+
+    def read_manifest_records():
+        nonlocal _count_entries, _count_rejected
+        _seen_content = False
+        with open(_manifest_file, 'r', encoding='utf-8', errors='replace') as manifest:
+            for line in manifest:
+                record = parse_manifest_line(line)
+                if record is None:
+                    _content = line.strip()
+                    if len(_content) != 0 and not _content.startswith('#'):
+                        # The first content line may be a header row (e.g. 'path,sha256')
+                        if _seen_content:
+                            _count_rejected += 1
+                        _seen_content = True
+                    continue
+                _seen_content = True
+                _count_entries += 1
+                if _count_entries % 100000 == 0:
+                    print(f'\r{Bcolors.White}Read: {_count_entries:,} entries{Bcolors.Endc}', end='', flush=True)
+                yield record
+
+    with open(_sorted_engine, 'r', encoding='utf-8') as engine:
+        _signatures = (line[:64] for line in engine)
+        for record in merge_join_hashes(external_sort(read_manifest_records(), _tmp_dir=_tmp_dir), _signatures):
+            _count_infected_file += 1
+            _hash, _path = record.rstrip('\n').split(',', 1)
+            print(f'\r{Bcolors.Red}[THREAT DETECTED]{Bcolors.Endc} {_path or "(no path)"} | {Bcolors.Yellow}SHA256: {_hash[:16]}...{Bcolors.Endc}')
+
+            threat_data = {
+                "datetime": datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
+                "scan_id": str(_log_scan_id),
+                "os": _log_os_ver,
+                "hostname": _log_hostname,
+                "ip": _log_ipaddr,
+                "infected_file": _path or "N/A",
+                "sha256": _hash,
+                "created_at": "N/A",
+                "modified_at": "N/A"
+            }
+            # Rewriting -threats.json per hit would cost O(hits^2) I/O, so log in batches
+            _threat_batch.append(threat_data)
+            if len(_threat_batch) >= THREAT_LOG_BATCH:
+                write_threat_logs(_threat_batch)
+                _threat_batch = []
+    if _threat_batch:
+        write_threat_logs(_threat_batch)
+    print('\n')
+
+    _scan_end_time = time.perf_counter()
+    scan_duration = _scan_end_time - _scan_start_time
+    scan_speed = _count_entries / scan_duration if scan_duration > 0 else 0
+
+    print(f'\n{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
+    print(f'{Bcolors.White}🏁 MANIFEST SCAN COMPLETED{Bcolors.Endc}')
+    print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
+    print(f'{Bcolors.Cyan}📊 Scan Summary:{Bcolors.Endc}')
+    print(f'   • Hashes Checked: {Bcolors.White}{_count_entries:,}{Bcolors.Endc}')
+    print(f'   • Lines Rejected: {Bcolors.Yellow if _count_rejected > 0 else Bcolors.White}{_count_rejected:,}{Bcolors.Endc}')
+    print(f'   • Scan Duration: {Bcolors.White}{scan_duration:.2f} seconds{Bcolors.Endc}')
+    print(f'   • Average Speed: {Bcolors.White}{scan_speed:.1f} hashes/sec{Bcolors.Endc}')
+
+    if _count_infected_file >= 1:
+        print(f'   • {Bcolors.Red}⚠️  THREATS DETECTED: {_count_infected_file} entries{Bcolors.Endc}')
+        print(f'\n{Bcolors.Yellow}📋 Detailed results saved to:{Bcolors.Endc}')
+        print(f'   • JSON Format: {Bcolors.White}{_make_output_dir}/{_today_}-threats.json{Bcolors.Endc}')
+        print(f'   • Text Format: {Bcolors.White}{_make_output_dir}/{_today_}-threats-structured.log{Bcolors.Endc}')
+    elif _count_entries == 0:
+        # Never report a manifest as clean when nothing in it could be checked
+        print(f'   • {Bcolors.Yellow}⚠️  NO HASHES CHECKED - expected "path,sha256" or one sha256 per line{Bcolors.Endc}')
+    else:
+        print(f'   • {Bcolors.Green}✅ No threats detected in manifest{Bcolors.Endc}')
+    if _count_rejected > 0:
+        print(f'   • {Bcolors.Yellow}⚠️  {_count_rejected:,} line(s) were not "path,sha256" or a plain sha256 and were skipped{Bcolors.Endc}')
+
+    print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}\n')
+    return _count_entries > 0
+
+
 def main():
     print(f'\n')
     print(f'{Bcolors.Green}▌║█║▌│║▌│║▌║▌█║ {Bcolors.Red}Simple Basic Malware Scanner {Bcolors.White}v{__version__}{Bcolors.Green} ▌│║▌║▌│║║▌█║▌║█{Bcolors.Endc}\n')
     opt = argparse.ArgumentParser(description='Simple Basic Malware Scanner')
     opt.add_argument('--path', help='ex) /home/download')
     opt.add_argument('--update', action='store_true', help='AV Engine Update')
+    opt.add_argument('--hashes', help='ex) /home/manifest.csv (path,sha256 or one sha256 per line)')
+    opt.add_argument('--tmp-dir', help='Directory for --hashes sort spill files (default: output/tmp)')
+    _shard_mode = opt.add_mutually_exclusive_group()
+    _shard_mode.add_argument('--shards', type=int, help='ex) 4 (scan --path with this many local worker processes, then merge)')
+    _shard_mode.add_argument('--shard', type=parse_shard, help='ex) 0/4 (worker: scan only this shard of --path, needs --scan-id)')
+    opt.add_argument('--shard-by', choices=['topdir', 'hash'], default='topdir', help='Partition by top-level directory or path hash')
+    opt.add_argument('--scan-id', help='Shared scan ID for workers of one sharded scan')
+    opt.add_argument('--merge', help='ex) output/shards/<scan_id> (merge shard results into one report)')
 
     if len(sys.argv) < 1:
         opt.print_help()
         sys.exit(1)
     else:
         options = opt.parse_args()
+        if options.shards is not None and options.shards < 2:
+            opt.error('--shards must be at least 2')
+        if options.shard and not options.scan_id:
+            opt.error('--shard requires --scan-id so all workers share one scan')
+        if (options.shard or options.shards) and not options.path:
+            opt.error('--shard/--shards require --path')
         print(f'- Run time: {_ctime_}')
         print('- For questions contact github.com/HPPAVILLIAN\t\t')
         print('\n')
@@ -426,11 +934,40 @@ def main():
             print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
             print(f'{Bcolors.White}🔧 MALWARE SCANNER INITIALIZATION{Bcolors.Endc}')
             print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
-            check_engine()
+            if options.shard:
+                # Workers share the engine; concurrent downloads would clobber each other
+                if not os.path.isfile(_engine_extract_file_):
+                    print(f'{Bcolors.Yellow}[-] {_engine_extract_file_} not found. Run --update before starting shard workers.{Bcolors.Endc}')
+                    sys.exit(1)
+            else:
+                check_engine()
             print(f'{Bcolors.Cyan}🗄️  Engine Updated: {Bcolors.White}{get_engine_last_updated_date(_engine_extract_file_)}{Bcolors.Endc}')
             print(f'{Bcolors.Cyan}🔍 AV Signatures: {Bcolors.White}{raw_count(_engine_extract_file_):,}{Bcolors.Endc}')
             print(f'{Bcolors.Green}✅ Scanner ready - Initiating scan...{Bcolors.Endc}\n')
-            scan_directory(_scan_path)
+            if options.shard:
+                _shard_index, _shard_count = options.shard
+                scan_directory(_scan_path, _shard_index, _shard_count, options.shard_by, options.scan_id)
+            elif options.shards:
+                if not run_local_shards(_scan_path, options.shards, options.shard_by):
+                    sys.exit(1)
+            else:
+                scan_directory(_scan_path)
+
+        elif options.merge:
+            if not merge_shard_results(os.path.abspath(options.merge)):
+                sys.exit(1)
+
+        elif options.hashes:
+            _manifest_file = os.path.abspath(options.hashes)
+            print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
+            print(f'{Bcolors.White}🔧 MALWARE SCANNER INITIALIZATION{Bcolors.Endc}')
+            print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
+            check_engine()
+            print(f'{Bcolors.Cyan}🗄️  Engine Updated: {Bcolors.White}{get_engine_last_updated_date(_engine_extract_file_)}{Bcolors.Endc}')
+            print(f'{Bcolors.Cyan}🔍 AV Signatures: {Bcolors.White}{raw_count(_engine_extract_file_):,}{Bcolors.Endc}')
+            print(f'{Bcolors.Green}✅ Scanner ready - Initiating manifest scan...{Bcolors.Endc}\n')
+            if not scan_hash_manifest(_manifest_file, os.path.abspath(options.tmp_dir) if options.tmp_dir else None):
+                sys.exit(1)
 
         elif options.update:
             print(f'{Bcolors.Green}═══════════════════════════════════════════════════════════════{Bcolors.Endc}')
@@ -454,3 +991,4 @@ if __name__ == '__main__':
         sys.exit(0)
     except Exception as e:
         print(f'{Bcolors.Yellow}- ::Exception:: Func:[{__name__}] Line:[{sys.exc_info()[-1].tb_lineno}] [{type(e).__name__}] {e}{Bcolors.Endc}')
+        sys.exit(1)